@@ -1,105 +1,41 @@
 import requests  # Import the requests module for making HTTP requests / Importa il modulo requests per effettuare richieste HTTP
-from typing import List, Dict, Optional, Set  # Import type hints from the typing module / Importa suggerimenti di tipo dal modulo typing
+from typing import Dict  # Import type hints from the typing module / Importa suggerimenti di tipo dal modulo typing
+import os  # Import the os module to atomically replace the output file / Importa il modulo os per sostituire atomicamente il file di output
+import re  # Import the re module to validate set codes / Importa il modulo re per validare i codici dei set
 import sys  # Import the sys module for system-specific parameters and functions / Importa il modulo sys per parametri e funzioni specifici del sistema
-from time import sleep  # Import the sleep function to add delays / Importa la funzione sleep per aggiungere ritardi
+from contextlib import ExitStack  # Import ExitStack to optionally manage the output file / Importa ExitStack per gestire opzionalmente il file di output
 import argparse  # Import the argparse module for parsing command-line arguments / Importa il modulo argparse per l'analisi degli argomenti della riga di comando
 import logging  # Import the logging module for logging messages / Importa il modulo logging per registrare messaggi
+from itertools import islice  # Import islice to consume the cards in batches / Importa islice per consumare le carte a blocchi
+from operator import itemgetter  # Import itemgetter for fast sort keys / Importa itemgetter per chiavi di ordinamento veloci
+import tempfile  # Import tempfile to write the decklist before replacing the output / Importa tempfile per scrivere la lista del mazzo prima di sostituire l'output
 from pathlib import Path  # Import the Path class from pathlib for filesystem paths / Importa la classe Path da pathlib per i percorsi del filesystem
-from enum import Enum, auto  # Import Enum and auto from the enum module for enumerations / Importa Enum e auto dal modulo enum per enumerazioni
 
-class Format(Enum):
-    """Supported Magic: The Gathering formats
-    Formati supportati di Magic: The Gathering
+from pyscryfall import Format, PyScryfall  # Import the Scryfall client and formats / Importa il client Scryfall e i formati
+
+OUTPUT_BATCH_SIZE = 1024  # Decklist lines written per batch / Righe della lista del mazzo scritte per blocco
+
+_SET_RE = re.compile(r'\A[a-z0-9]{3,6}\Z')  # Set codes are 3-6 alphanumeric characters / I codici dei set sono di 3-6 caratteri alfanumerici
+_VALID_COLORS = frozenset('wubrg')  # Valid color characters / Caratteri di colore validi
+_FORMAT_BY_VALUE = {f.value: f for f in Format}  # Formats indexed by their value / Formati indicizzati per valore
+
+def discard_file(path: str) -> None:
+    """Remove a file if it still exists.
+    Rimuovi un file se esiste ancora.
     """
-    STANDARD = 'standard'
-    MODERN = 'modern'
-    LEGACY = 'legacy'
-    VINTAGE = 'vintage'
-    COMMANDER = 'commander'
-    PAUPER = 'pauper'
-    PIONEER = 'pioneer'
-    BRAWL = 'brawl'
-    HISTORIC = 'historic'
-    PENNY = 'penny'
+    try:
+        os.remove(path)  # Delete the leftover file / Elimina il file residuo
+    except FileNotFoundError:
+        pass
 
-class PyScryfall:
-    def __init__(self, verbose: bool = False):
-        """
-        Initialize the PyScryfall client.
-        Inizializza il client PyScryfall.
-        
-        Args:
-            verbose (bool): Enable verbose logging if True.
-                            Abilita il logging verboso se True.
-        """
-        self.base_url = "https://api.scryfall.com"  # Base URL for the Scryfall API / URL di base per l'API di Scryfall
-        self.search_endpoint = "/cards/search"  # Endpoint for searching cards / Endpoint per la ricerca di carte
-        self.delay = 0.1  # 100ms delay between requests as per Scryfall guidelines / Ritardo di 100 ms tra le richieste secondo le linee guida di Scryfall
-        
-        # Setup logging
-        log_level = logging.DEBUG if verbose else logging.INFO  # Set logging level based on verbose flag / Imposta il livello di registrazione in base al flag verbose
-        logging.basicConfig(
-            level=log_level,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        self.logger = logging.getLogger(__name__)  # Get a logger instance / Ottieni un'istanza del logger
-        
-    def search_cards(self, set_code: str, format_name: Format, colors: Optional[str] = None) -> List[Dict]:
-        """
-        Search for cards in a specific set and format.
-        Cerca carte in un set specifico e formato.
-        
-        Args:
-            set_code (str): The set code to search for.
-                            Il codice del set da cercare.
-            format_name (Format): The format to filter by.
-                                  Il formato da filtrare.
-            colors (str, optional): Color filter (w,u,b,r,g).
-                                    Filtro colore (w,u,b,r,g).
-            
-        Returns:
-            List[Dict]: List of card data dictionaries.
-                        Elenco di dizionari di dati delle carte.
-        """
-        url = f"{self.base_url}{self.search_endpoint}"  # Construct the full URL for the search endpoint / Costruisci l'URL completo per l'endpoint di ricerca
-        query = f'f:{format_name.value} e:{set_code}'  # Form the query string / Forma la stringa di query
-        
-        if colors:
-            query += f' c:{colors}'  # Append color filters to the query if provided / Aggiungi filtri di colore alla query se forniti
-            
-        params = {
-            'order': 'name',
-            'q': query
-        }
-        
-        try:
-            all_cards = []  # Initialize an empty list to store card data / Inizializza una lista vuota per memorizzare i dati delle carte
-            has_more = True  # Flag to control pagination / Flag per controllare la paginazione
-            page = 1  # Start from the first page / Inizia dalla prima pagina
-            
-            while has_more:
-                self.logger.debug(f"Fetching page {page} from Scryfall API")  # Log the current page being fetched / Registra la pagina corrente in fase di recupero
-                response = requests.get(url, params=params)  # Make the API request / Effettua la richiesta API
-                response.raise_for_status()  # Raise an error if the request failed / Solleva un errore se la richiesta è fallita
-                
-                data = response.json()  # Parse the JSON response / Analizza la risposta JSON
-                cards = data.get('data', [])  # Extract card data / Estrai i dati delle carte
-                all_cards.extend(cards)  # Add the cards to the list / Aggiungi le carte alla lista
-                
-                self.logger.info(f"Fetched page {page} - Found {len(cards)} cards")  # Log the number of cards fetched / Registra il numero di carte recuperate
-                
-                has_more = data.get('has_more', False)  # Check if there are more pages / Controlla se ci sono altre pagine
-                if has_more:
-                    params['page'] = page + 1  # Increment the page number / Incrementa il numero di pagina
-                    page += 1
-                    sleep(self.delay)  # Wait for a short delay before next request / Attendi un breve ritardo prima della prossima richiesta
-                    
-            return all_cards
-            
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"Error fetching data from Scryfall: {e}")  # Log an error message if the request failed / Registra un messaggio di errore se la richiesta è fallita
-            sys.exit(1)  # Exit the program with an error code / Esci dal programma con un codice di errore
+def validate_set(value: str) -> str:
+    """Validate the set code argument.
+    Valida l'argomento del codice del set.
+    """
+    set_code = value.lower()  # Set codes are case-insensitive / I codici dei set non distinguono le maiuscole
+    if not _SET_RE.match(set_code):
+        raise argparse.ArgumentTypeError(f"{value} is not a valid set code")  # Raise an error if the code is malformed / Solleva un errore se il codice è malformato
+    return set_code
 
 def validate_copies(value: str) -> int:
     """Validate the number of copies argument.
@@ -117,19 +53,18 @@ def validate_colors(value: str) -> str:
     """Validate the colors argument.
     Valida l'argomento dei colori.
     """
-    valid_colors = set('wubrg')  # Define the set of valid color characters / Definisci l'insieme dei caratteri di colore validi
-    colors = set(value.lower())  # Convert the input value to lowercase / Converti il valore di input in minuscolo
-    if not colors.issubset(valid_colors):
+    colors = value.lower()  # Convert the input value to lowercase once / Converti il valore di input in minuscolo una sola volta
+    if any(c not in _VALID_COLORS for c in colors):
         raise argparse.ArgumentTypeError(f"Invalid colors. Use combinations of: w,u,b,r,g")  # Raise an error if the input contains invalid colors / Solleva un errore se l'input contiene colori non validi
-    return value.lower()
+    return colors
 
 def validate_format(value: str) -> Format:
     """Validate the format argument.
     Valida l'argomento del formato.
     """
     try:
-        return Format(value.lower())  # Convert the value to a Format enum / Converti il valore in un'enumerazione Format
-    except ValueError:
+        return _FORMAT_BY_VALUE[value.lower()]  # Look up the Format enum by value / Cerca l'enumerazione Format per valore
+    except KeyError:
         valid_formats = ", ".join(f.value for f in Format)  # Create a string of valid formats / Crea una stringa di formati validi
         raise argparse.ArgumentTypeError(
             f"Invalid format. Valid formats are: {valid_formats}"
@@ -148,11 +83,18 @@ def get_interactive_input() -> Dict:
     print("-" * 40)
     
     # Get set code
-    set_code = input("Enter set code (e.g., neo for Kamigawa: Neon Dynasty): ").strip()  # Prompt the user for the set code / Richiedi all'utente il codice del set
+    while True:
+        try:
+            set_input = input("Enter set code (e.g., neo for Kamigawa: Neon Dynasty): ").strip()  # Prompt the user for the set code / Richiedi all'utente il codice del set
+            set_code = validate_set(set_input)  # Reject malformed codes before any request is made / Rifiuta i codici malformati prima di effettuare richieste
+            break
+        except argparse.ArgumentTypeError as e:
+            print(e)
     
     # Get format
+    formats = tuple(Format)  # Snapshot the formats once for display and lookup / Acquisisci i formati una volta per visualizzazione e ricerca
     print("\nAvailable formats:")
-    for i, format_type in enumerate(Format, 1):
+    for i, format_type in enumerate(formats, 1):
         print(f"{i}. {format_type.value}")  # Display the available formats / Mostra i formati disponibili
     while True:
         try:
@@ -161,7 +103,7 @@ def get_interactive_input() -> Dict:
                 format_name = Format.PAUPER  # Default to pauper format if no choice is made / Imposta il formato predefinito su pauper se non viene effettuata alcuna scelta
                 break
             format_index = int(format_choice) - 1
-            format_name = list(Format)[format_index]  # Map the user's choice to the Format enum / Mappa la scelta dell'utente all'enumerazione Format
+            format_name = formats[format_index]  # Map the user's choice to the Format enum / Mappa la scelta dell'utente all'enumerazione Format
             break
         except (ValueError, IndexError):
             print("Please enter a valid format number")  # Prompt the user again if the input is invalid / Richiedi nuovamente all'utente se l'input non è valido
@@ -197,7 +139,8 @@ def get_interactive_input() -> Dict:
         'copies': copies,
         'colors': colors,
         'output': output,
-        'verbose': verbose
+        'verbose': verbose,
+        'no_cache': False
     }
 
 def setup_argparse() -> argparse.ArgumentParser:
@@ -212,6 +155,7 @@ def setup_argparse() -> argparse.ArgumentParser:
     # Make all arguments optional to support interactive mode
     parser.add_argument(
         '--set', '-s',
+        type=validate_set,
         help='Set code (e.g., neo for Kamigawa: Neon Dynasty)'
     )
     
@@ -247,6 +191,12 @@ def setup_argparse() -> argparse.ArgumentParser:
         help='Enable verbose output'
     )
     
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Discard cached Scryfall responses before searching'
+    )
+    
     parser.add_argument(
         '--version',
         action='version',
@@ -271,42 +221,75 @@ def main():
             'copies': args.copies,
             'colors': args.colors,
             'output': args.output,
-            'verbose': args.verbose
+            'verbose': args.verbose,
+            'no_cache': args.no_cache
         }
     
     # Initialize PyScryfall with verbose flag
     client = PyScryfall(verbose=params['verbose'])  # Initialize the PyScryfall client / Inizializza il client PyScryfall
     
     try:
-        # Fetch cards
-        cards = client.search_cards(params['set'], params['format'], params['colors'])  # Search for cards using the provided parameters / Cerca carte utilizzando i parametri forniti
-        
-        # Prepare output
-        decklist = []  # Initialize an empty list for the decklist / Inizializza una lista vuota per la lista del mazzo
-        for card in cards:
-            if params['copies'] > 0:
-                line = f"{params['copies']} {card['name']} ({card['set'].upper()})"  # Format the output line with copies / Format the output line with copies
-            else:
-                line = f"{card['name']} ({card['set'].upper()})"  # Format the output line without copies / Format the output line without copies
-            decklist.append(line)  # Add the line to the decklist / Aggiungi la riga alla lista del mazzo
+        with client, ExitStack() as stack:
+            if params['no_cache']:
+                client.clear_cache()  # Drop stale responses so the search hits the API / Elimina le risposte obsolete in modo che la ricerca interroghi l'API
+            cards = client.iter_cards(params['set'], params['format'], params['colors'])  # Stream cards using the provided parameters / Scorri le carte utilizzando i parametri forniti
+            
+            f = None  # Output file handle, if any / Handle del file di output, se presente
+            if params['output']:
+                params['output'].parent.mkdir(parents=True, exist_ok=True)  # Create the output directory if it doesn't exist / Crea la directory di output se non esiste
+                # Stream into a temporary file next to the target, so an existing decklist survives a failed fetch
+                f = tempfile.NamedTemporaryFile(
+                    'w',
+                    encoding='utf-8',
+                    buffering=1 << 16,
+                    dir=params['output'].parent,
+                    prefix=f".{params['output'].name}.",
+                    suffix='.tmp',
+                    delete=False
+                )  # Open the temporary file once with a large buffer / Apri il file temporaneo una sola volta con un buffer ampio
+                # The stack unwinds last in, first out, so the file is closed before it is removed
+                stack.callback(discard_file, f.name)  # Remove the temporary file if anything goes wrong / Rimuovi il file temporaneo in caso di errore
+                stack.callback(f.close)  # Close the temporary file first / Chiudi prima il file temporaneo
+            
+            streams = [sys.stdout] if f is None else [sys.stdout, f]  # Destinations for the decklist / Destinazioni della lista del mazzo
+            
+            print("\nDecklist format:")
+            print("-" * 40)
+            
+            # Format, print and save the lines as the pages arrive, in bounded batches
+            prefix = f"{params['copies']} " if params['copies'] > 0 else ""  # Copies prefix, computed once / Prefisso delle copie, calcolato una volta
+            suffix = f" ({params['set'].upper()})"  # Every card belongs to the searched set / Ogni carta appartiene al set cercato
+            separator = suffix + '\n' + prefix  # Joins consecutive card names into lines / Unisce i nomi consecutivi delle carte in righe
+            names = map(itemgetter('name'), cards)  # Card names, in output order / Nomi delle carte, nell'ordine di output
+            count = 0  # Number of cards written so far / Numero di carte scritte finora
+            while True:
+                batch = list(islice(names, OUTPUT_BATCH_SIZE))  # Next batch of names / Prossimo blocco di nomi
+                if not batch:
+                    break
+                block = prefix + separator.join(batch) + suffix + '\n'  # Format the whole batch with a single join / Formatta l'intero blocco con un'unica join
+                for stream in streams:
+                    stream.write(block)  # Write the whole block at once / Scrivi l'intero blocco in una volta
+                count += len(batch)
+            sys.stdout.flush()  # Flush the console once at the end / Svuota il buffer della console una sola volta alla fine
+            
+            if f is not None:
+                f.close()  # Flush the decklist to disk before moving it / Scrivi la lista del mazzo su disco prima di spostarla
+                umask = os.umask(0)  # Read the process umask / Leggi la umask del processo
+                os.umask(umask)
+                os.chmod(f.name, 0o666 & ~umask)  # Give the file the permissions a regular open() would / Assegna al file i permessi che avrebbe con una normale open()
+                os.replace(f.name, params['output'])  # Replace the target only once every page has arrived / Sostituisci il file di destinazione solo dopo aver ricevuto tutte le pagine
         
-        # Print to console
-        print(f"\nFound {len(cards)} {params['format'].value.title()}-legal cards in set {params['set'].upper()}")  # Print the summary / Stampa il riepilogo
-        print("\nDecklist format:")
-        print("-" * 40)
-        for line in decklist:
-            print(line)  # Print each line of the decklist / Stampa ogni riga della lista del mazzo
+        # Print the summary once the whole decklist has been streamed
+        print(f"\nFound {count} {params['format'].value.title()}-legal cards in set {params['set'].upper()}")  # Print the summary / Stampa il riepilogo
         
-        # Save to file if specified
         if params['output']:
-            params['output'].parent.mkdir(parents=True, exist_ok=True)  # Create the output directory if it doesn't exist / Crea la directory di output se non esiste
-            with params['output'].open('w', encoding='utf-8') as f:
-                for line in decklist:
-                    f.write(f"{line}\n")  # Write each line to the output file / Scrivi ogni riga nel file di output
             print(f"\nDecklist saved to {params['output']}")  # Print confirmation message / Stampa il messaggio di conferma
             
+    except requests.exceptions.RequestException as e:
+        logging.error("Error fetching data from Scryfall: %s", e)  # Log an error message if the request failed / Registra un messaggio di errore se la richiesta è fallita
+        sys.exit(1)  # Exit the program with an error code / Esci dal programma con un codice di errore
     except Exception as e:
-        logging.error(f"An error occurred: {e}")  # Log an error message if an exception occurs / Registra un messaggio di errore se si verifica un'eccezione
+        logging.error("An error occurred: %s", e)  # Log an error message if an exception occurs / Registra un messaggio di errore se si verifica un'eccezione
         sys.exit(1)  # Exit the program with an error code / Esci dal programma con un codice di errore
 
 if __name__ == "__main__":
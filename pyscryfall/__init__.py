@@ -0,0 +1,8 @@
+"""
+Python client for the Scryfall API.
+Client Python per l'API di Scryfall.
+"""
+from .client import PyScryfall  # Re-export the client / Riesporta il client
+from .formats import Format  # Re-export the supported formats / Riesporta i formati supportati
+
+__all__ = ['Format', 'PyScryfall']
@@ -0,0 +1,237 @@
+import requests  # Import the requests module for making HTTP requests / Importa il modulo requests per effettuare richieste HTTP
+from requests.adapters import HTTPAdapter  # Import the HTTPAdapter to configure connection pooling / Importa HTTPAdapter per configurare il pool di connessioni
+from urllib3.util.retry import Retry  # Import the Retry policy for transient HTTP errors / Importa la politica Retry per errori HTTP temporanei
+try:
+    from requests_cache import CachedSession  # Import the optional on-disk HTTP cache / Importa la cache HTTP opzionale su disco
+except ImportError:
+    CachedSession = None  # Fall back to an uncached session / Ripiega su una sessione senza cache
+try:
+    from orjson import loads as json_loads  # Import the fast orjson decoder / Importa il decoder veloce orjson
+except ImportError:
+    from json import loads as json_loads  # Fall back to the standard library decoder / Ripiega sul decoder della libreria standard
+from typing import Iterator, List, Dict, Optional  # Import type hints from the typing module / Importa suggerimenti di tipo dal modulo typing
+import math  # Import the math module to compute the number of pages / Importa il modulo math per calcolare il numero di pagine
+from concurrent.futures import ThreadPoolExecutor  # Import the thread pool to fetch pages concurrently / Importa il pool di thread per recuperare le pagine in parallelo
+import threading  # Import the threading module to coordinate concurrent requests / Importa il modulo threading per coordinare le richieste concorrenti
+from time import monotonic, sleep  # Import the clock and sleep functions to pace requests / Importa le funzioni di orologio e di attesa per distanziare le richieste
+import logging  # Import the logging module for logging messages / Importa il modulo logging per registrare messaggi
+from itertools import chain, islice  # Import chain to walk the first page together with the rest, islice to take the next page number / Importa chain per scorrere la prima pagina insieme alle altre, islice per prendere il numero della pagina successiva
+from collections import deque  # Import deque to queue the pages in flight / Importa deque per accodare le pagine in corso
+
+from .formats import Format  # Import the supported formats / Importa i formati supportati
+
+class PyScryfall:
+    def __init__(self, verbose: bool = False, use_cache: bool = True):
+        """
+        Initialize the PyScryfall client.
+        Inizializza il client PyScryfall.
+        
+        Args:
+            verbose (bool): Enable verbose logging if True.
+                            Abilita il logging verboso se True.
+            use_cache (bool): Cache responses on disk if requests-cache is installed.
+                              Memorizza le risposte su disco se requests-cache è installato.
+        """
+        self.base_url = "https://api.scryfall.com"  # Base URL for the Scryfall API / URL di base per l'API di Scryfall
+        self.search_endpoint = "/cards/search"  # Endpoint for searching cards / Endpoint per la ricerca di carte
+        self.delay = 0.1  # 100ms delay between requests as per Scryfall guidelines / Ritardo di 100 ms tra le richieste secondo le linee guida di Scryfall
+        self.page_size = 175  # Cards returned per page by the search endpoint / Carte restituite per pagina dall'endpoint di ricerca
+        self.max_workers = 5  # Maximum number of pages fetched concurrently / Numero massimo di pagine recuperate in parallelo
+        self._throttle = threading.Lock()  # Serializes the delay between concurrent requests / Serializza il ritardo tra richieste concorrenti
+        self._next_request_at = 0.0  # Monotonic time at which the next request may start / Istante monotono in cui può iniziare la prossima richiesta
+        self.timeout = 10  # Timeout in seconds for each request / Timeout in secondi per ogni richiesta
+        
+        # Setup a persistent HTTP session so the connection is reused across pages
+        if use_cache and CachedSession is not None:
+            self.session = CachedSession(
+                'scryfall_cache',
+                backend='sqlite',
+                expire_after=86400,
+                allowable_methods=('GET',),
+                cache_control=True
+            )  # Cache responses for 24 hours, honoring Scryfall's Cache-Control headers / Memorizza le risposte per 24 ore, rispettando gli header Cache-Control di Scryfall
+        else:
+            self.session = requests.Session()  # Keep-alive session shared by all requests / Sessione keep-alive condivisa da tutte le richieste
+        self.session.headers.update({
+            'User-Agent': 'pyScryfall/1.0',
+            'Accept': 'application/json'
+        })  # Identify the client as requested by Scryfall / Identifica il client come richiesto da Scryfall
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=True
+        )  # Retry transient errors with exponential backoff, honoring Retry-After / Riprova gli errori temporanei con backoff esponenziale, rispettando Retry-After
+        self.session.mount('https://', HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=10))  # Pool connections to the API host / Raggruppa le connessioni verso l'host dell'API
+        
+        # Setup logging
+        log_level = logging.DEBUG if verbose else logging.INFO  # Set logging level based on verbose flag / Imposta il livello di registrazione in base al flag verbose
+        logging.basicConfig(
+            level=log_level,
+            format='%(asctime)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+        self.logger = logging.getLogger(__name__)  # Get a logger instance / Ottieni un'istanza del logger
+        
+    def close(self) -> None:
+        """
+        Release the HTTP session and its pooled connections.
+        Rilascia la sessione HTTP e le sue connessioni nel pool.
+        """
+        self.session.close()  # Close all pooled connections / Chiudi tutte le connessioni nel pool
+        
+    def clear_cache(self) -> None:
+        """
+        Discard all cached Scryfall responses.
+        Elimina tutte le risposte di Scryfall memorizzate nella cache.
+        """
+        if hasattr(self.session, 'cache'):
+            self.session.cache.clear()  # Empty the on-disk cache / Svuota la cache su disco
+        else:
+            self.logger.warning("requests-cache is not installed, there is no cache to clear")  # Don't let the request go silently ignored / Non ignorare silenziosamente la richiesta
+        
+    def __enter__(self) -> 'PyScryfall':
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()  # Always release the session when leaving the context / Rilascia sempre la sessione all'uscita dal contesto
+        
+    def _fetch_page(self, url: str, params: Dict) -> Dict:
+        """
+        Fetch and decode a single page of search results, respecting the rate limit.
+        Recupera e decodifica una singola pagina di risultati, rispettando il limite di frequenza.
+        
+        Cards are cut down to 'name' and 'set' here, so the full records are dropped by the worker.
+        Le carte sono ridotte a 'name' e 'set' qui, così i record completi vengono scartati dal worker.
+        """
+        with self._throttle:
+            remaining = self._next_request_at - monotonic()  # Time left since the previous request started / Tempo rimanente dall'inizio della richiesta precedente
+            if remaining > 0:
+                sleep(remaining)  # Only wait for what is left of the delay / Attendi solo la parte rimanente del ritardo
+            self._next_request_at = monotonic() + self.delay  # Earliest start for the next request / Inizio minimo per la prossima richiesta
+            slot = self._next_request_at  # The slot reserved by this request / Lo slot riservato da questa richiesta
+        response = self.session.get(url, params=params, timeout=self.timeout)  # Make the API request on the pooled session / Effettua la richiesta API sulla sessione condivisa
+        if getattr(response, 'from_cache', False):
+            with self._throttle:
+                # Cache hits never reached Scryfall, so give the delay back unless another request has reserved a later slot since
+                if self._next_request_at == slot:
+                    self._next_request_at = monotonic()
+        if response.status_code == 404:
+            return {}  # Scryfall answers 404 when no cards match, so skip decoding the error body / Scryfall risponde 404 quando nessuna carta corrisponde, quindi evita di decodificare il corpo dell'errore
+        response.raise_for_status()  # Raise an error if the request failed / Solleva un errore se la richiesta è fallita
+        data = json_loads(response.content)  # Parse the raw JSON bytes / Analizza i byte JSON grezzi
+        data['data'] = [{'name': c['name'], 'set': c['set']} for c in data.get('data', [])]  # Keep only the fields used for the decklist / Mantieni solo i campi usati per la lista del mazzo
+        return data
+        
+    def _iter_pages(self, set_code: str, format_name: Format, colors: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Yield the decoded result pages of a search, in page order.
+        Restituisce le pagine decodificate di una ricerca, in ordine di pagina.
+        """
+        url = f"{self.base_url}{self.search_endpoint}"  # Construct the full URL for the search endpoint / Costruisci l'URL completo per l'endpoint di ricerca
+        query = f'f:{format_name.value} e:{set_code}'  # Form the query string / Forma la stringa di query
+        
+        if colors:
+            query += f' c:{colors}'  # Append color filters to the query if provided / Aggiungi filtri di colore alla query se forniti
+            
+        params = {
+            'order': 'name',  # Scryfall's default, requested explicitly since iter_cards relies on it / Predefinito di Scryfall, richiesto esplicitamente perché iter_cards ne dipende
+            'q': query
+        }
+        
+        self.logger.debug("Fetching page 1 from Scryfall API")  # Log the first page being fetched / Registra la prima pagina in fase di recupero
+        data = self._fetch_page(url, params)  # Fetch the first page / Recupera la prima pagina
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = deque()  # Pages in flight, in page order / Pagine in corso, in ordine di pagina
+            pages = iter(())  # Page numbers still to request / Numeri di pagina ancora da richiedere
+            if data.get('has_more', False):
+                # The first page reports the total, so the remaining pages can be requested right away
+                n_pages = math.ceil(data['total_cards'] / self.page_size)  # Number of pages to fetch / Numero di pagine da recuperare
+                pages = iter(range(2, n_pages + 1))
+            
+            def submit_next() -> None:
+                for page in islice(pages, 1):
+                    self.logger.debug("Fetching page %d from Scryfall API", page)  # Log the current page being fetched / Registra la pagina corrente in fase di recupero
+                    futures.append((page, pool.submit(self._fetch_page, url, {**params, 'page': page})))  # Request the page in the background / Richiedi la pagina in background
+            
+            for _ in range(self.max_workers):
+                submit_next()  # Keep at most max_workers pages in flight / Mantieni al massimo max_workers pagine in corso
+            
+            try:
+                # Hand out the first page while the next ones are in flight
+                self.logger.info("Fetched page 1 - Found %d cards", len(data.get('data', [])))  # Log the number of cards fetched / Registra il numero di carte recuperate
+                yield data
+                
+                while futures:
+                    page, future = futures.popleft()
+                    data = future.result()  # Wait for the page / Attendi la pagina
+                    self.logger.info("Fetched page %d - Found %d cards", page, len(data.get('data', [])))  # Log the number of cards fetched / Registra il numero di carte recuperate
+                    yield data
+                    submit_next()  # Replace the consumed page with the next one / Sostituisci la pagina consumata con la successiva
+            finally:
+                for _, future in futures:
+                    future.cancel()  # Drop requests not yet started if the caller stops early / Annulla le richieste non ancora avviate se il chiamante si ferma prima
+        
+    def iter_cards(self, set_code: str, format_name: Format, colors: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Iterate over the cards of a set and format as their pages arrive.
+        Itera sulle carte di un set e formato man mano che arrivano le pagine.
+        
+        Cards come sorted by name, as requested from Scryfall. At most max_workers pages, already cut down to 'name' and 'set', are held at a time.
+        Le carte arrivano ordinate per nome, come richiesto a Scryfall. Al massimo max_workers pagine, già ridotte a 'name' e 'set', sono mantenute alla volta.
+        
+        Args:
+            set_code (str): The set code to search for.
+                            Il codice del set da cercare.
+            format_name (Format): The format to filter by.
+                                  Il formato da filtrare.
+            colors (str, optional): Color filter (w,u,b,r,g).
+                                    Filtro colore (w,u,b,r,g).
+            
+        Yields:
+            Dict: Card dictionary holding 'name' and 'set'.
+                  Dizionario della carta con 'name' e 'set'.
+                  
+        Raises:
+            requests.exceptions.RequestException: If a request still fails after retrying.
+                                                  Se una richiesta fallisce anche dopo i tentativi.
+        """
+        for data in self._iter_pages(set_code, format_name, colors):
+            yield from data.get('data', [])  # Cards were already cut down to 'name' and 'set' / Le carte sono già ridotte a 'name' e 'set'
+        
+    def search_cards(self, set_code: str, format_name: Format, colors: Optional[str] = None) -> List[Dict]:
+        """
+        Search for cards in a specific set and format.
+        Cerca carte in un set specifico e formato.
+        
+        Args:
+            set_code (str): The set code to search for.
+                            Il codice del set da cercare.
+            format_name (Format): The format to filter by.
+                                  Il formato da filtrare.
+            colors (str, optional): Color filter (w,u,b,r,g).
+                                    Filtro colore (w,u,b,r,g).
+            
+        Returns:
+            List[Dict]: List of card dictionaries holding 'name' and 'set', sorted by name by Scryfall.
+                        Elenco di dizionari delle carte con 'name' e 'set', ordinato per nome da Scryfall.
+                        
+        Raises:
+            requests.exceptions.RequestException: If a request still fails after retrying.
+                                                  Se una richiesta fallisce anche dopo i tentativi.
+        """
+        pages = self._iter_pages(set_code, format_name, colors)  # Result pages, in page order / Pagine dei risultati, in ordine di pagina
+        first = next(pages)  # The first page carries the total / La prima pagina riporta il totale
+        
+        all_cards = [None] * first.get('total_cards', 0)  # Pre-size the list from the reported total / Pre-dimensiona la lista in base al totale riportato
+        offset = 0  # Next free slot in the list / Prossima posizione libera nella lista
+        
+        for data in chain((first,), pages):
+            cards = data.get('data', [])  # Extract card data / Estrai i dati delle carte
+            all_cards[offset:offset + len(cards)] = cards  # Cards were already cut down to 'name' and 'set' / Le carte sono già ridotte a 'name' e 'set'
+            offset += len(cards)
+            
+        del all_cards[offset:]  # Drop unused slots if fewer cards arrived than reported / Rimuovi le posizioni inutilizzate se sono arrivate meno carte del previsto
+        return all_cards
@@ -0,0 +1,16 @@
+from enum import Enum  # Import Enum from the enum module for enumerations / Importa Enum dal modulo enum per enumerazioni
+
+class Format(Enum):
+    """Supported Magic: The Gathering formats
+    Formati supportati di Magic: The Gathering
+    """
+    STANDARD = 'standard'
+    MODERN = 'modern'
+    LEGACY = 'legacy'
+    VINTAGE = 'vintage'
+    COMMANDER = 'commander'
+    PAUPER = 'pauper'
+    PIONEER = 'pioneer'
+    BRAWL = 'brawl'
+    HISTORIC = 'historic'
+    PENNY = 'penny'
@@ -1,44 +1,200 @@
 import requests
 import json
 import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from collections import deque
+from itertools import chain, islice
+from operator import itemgetter
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
 
-def fetch_cards(set_name, legal_format='pauper', common_only=False):
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj, indent=True):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+except ImportError:  # Fall back to the standard library
+    _loads = json.loads
+
+    def _dumps(obj, indent=True):
+        if indent:
+            return json.dumps(obj, indent=2).encode('utf-8')
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+SEARCH_URL = 'https://api.scryfall.com/cards/search'
+PAGE_SIZE = 175  # Cards per page returned by the search endpoint
+MAX_WORKERS = 5
+REQUEST_DELAY = 0.1
+# Formats Scryfall reports legality for (the keys of a card's "legalities" object)
+_LEGAL_FORMATS = (
+    'pauper', 'standard', 'pioneer', 'modern', 'legacy', 'vintage', 'commander',
+    'brawl', 'standardbrawl', 'historic', 'timeless', 'alchemy', 'explorer', 'gladiator',
+    'penny', 'oathbreaker', 'paupercommander', 'duel', 'oldschool', 'premodern', 'predh', 'future'
+)
+
+# Card fields kept by default; pass fields=None to keep the full Scryfall records
+DEFAULT_FIELDS = ('name', 'set', 'collector_number', 'rarity', 'mana_cost', 'type_line')
+_INTERNED_FIELDS = ('set', 'rarity')
+_PACE_LOCK = threading.Lock()
+_next_request_at = 0.0
+_DIGITS = re.compile(r'\d+')
+
+# Shared session so every page reuses the same keep-alive connection
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    'Accept': 'application/json',
+    'User-Agent': 'pyScryfall/1.0',
+    # Every encoding urllib3 can decode here: gzip/deflate, plus br when brotli is installed
+    'Accept-Encoding': make_headers(accept_encoding=True)['accept-encoding']
+})
+# Transient errors and rate limiting (429 + Retry-After) are retried with backoff at the pool level
+# One host, one keep-alive connection per worker: pool_block caps the sockets at MAX_WORKERS
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=MAX_WORKERS,
+    pool_block=True,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        respect_retry_after_header=True,
+        allowed_methods=frozenset(['GET'])
+    )
+))
+
+def _fetch_page(params, fields=None):
+    global _next_request_at
+    # Token bucket shared by the worker threads: requests start at most once every REQUEST_DELAY
+    with _PACE_LOCK:
+        wait = _next_request_at - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _next_request_at = time.monotonic() + REQUEST_DELAY
+    response = _SESSION.get(SEARCH_URL, params=params, timeout=(5, 30))
+    if response.status_code == 404:
+        return {'data': []}  # Scryfall answers 404 when no cards match
+    response.raise_for_status()
+    data = _loads(response.content)
+    cards = data['data']
+    if fields:
+        # Keep only the requested fields so the full card dicts are freed before the page leaves the worker
+        cards = [{k: card.get(k) for k in fields} for card in cards]
+    # Set codes and rarities repeat on every card, so all cards share one string per value
+    for card in cards:
+        for key in _INTERNED_FIELDS:
+            value = card.get(key)
+            if value is not None:
+                card[key] = sys.intern(value)
+    data['data'] = cards
+    return data
+
+def _build_query(set_name, legal_format, common_only):
     query = f'set:{set_name} legal:{legal_format}'
     if common_only:
         query += ' rarity:common'
-    
-    url = f"https://api.scryfall.com/cards/search"
+    return query
+
+# Yields the cards of each result page, in page order, optionally projected to the given fields
+def _fetch_cards_pages(query, fields=None):
     params = {
         'q': query,
         'order': 'set',
         'unique': 'prints'
     }
-    cards = []
-    while url:
-        response = requests.get(url, params=params)
-        if response.status_code == 200:
-            data = response.json()
-            cards.extend(data['data'])
-            url = data.get('next_page')
-            params = {}  # Clear params for subsequent pages
-        else:
-            print(f"Error: {response.status_code}")
-            break
+    data = _fetch_page(params, fields)
+    yield data['data']
+    if not data.get('has_more'):
+        return
+    # The first page reports total_cards, so the remaining pages can be fetched concurrently
+    n_pages = -(-data['total_cards'] // PAGE_SIZE)
+    pages = iter(range(2, n_pages + 1))
+    futures = deque()
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # At most MAX_WORKERS pages are held at once; the next one is requested only after the caller is done with a page
+        for page in islice(pages, MAX_WORKERS):
+            futures.append(executor.submit(_fetch_page, {**params, 'page': page}, fields))
+        try:
+            while futures:
+                yield futures.popleft().result()['data']
+                for page in islice(pages, 1):
+                    futures.append(executor.submit(_fetch_page, {**params, 'page': page}, fields))
+        finally:
+            for future in futures:
+                future.cancel()  # Cancels the pages not yet requested
+
+# Identical queries within the same process are served from memory; the returned list is shared, so don't mutate it
+@lru_cache(maxsize=32)
+def fetch_cards(set_name, legal_format='pauper', common_only=False, fields=DEFAULT_FIELDS):
+    query = _build_query(set_name, legal_format, common_only)
+    cards = list(chain.from_iterable(_fetch_cards_pages(query, fields)))
     return cards, query
 
+# Yields one card at a time, holding at most MAX_WORKERS pages in memory
+def iter_cards(set_name, legal_format='pauper', common_only=False, fields=DEFAULT_FIELDS):
+    query = _build_query(set_name, legal_format, common_only)
+    for page in _fetch_cards_pages(query, fields):
+        yield from page
+
+# Writes the cards to out_path as JSON Lines as each page arrives, holding at most MAX_WORKERS pages in memory
+def fetch_cards_streaming(set_name, legal_format, common_only, out_path, fields=DEFAULT_FIELDS):
+    query = _build_query(set_name, legal_format, common_only)
+    count = 0
+    # Write next to the target and swap it in only once every page has arrived, so a failure never leaves a truncated file
+    out_dir, out_name = os.path.split(os.path.abspath(out_path))
+    f = tempfile.NamedTemporaryFile('wb', dir=out_dir, prefix=f'.{out_name}.', suffix='.tmp', delete=False)
+    try:
+        with f:
+            for page in _fetch_cards_pages(query, fields):
+                for card in page:
+                    f.write(_dumps(card, indent=False))
+                    f.write(b'\n')
+                count += len(page)
+        # NamedTemporaryFile creates the file as 0600; give it the permissions a plain open() would
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(f.name, 0o666 & ~umask)
+        os.replace(f.name, out_path)
+    except BaseException:
+        os.remove(f.name)
+        raise
+    return count, query
+
+# Reads back a file written by fetch_cards_streaming one card at a time
+def iter_jsonl(path):
+    with open(path, 'rb') as f:
+        for line in f:
+            yield _loads(line)
+
 def save_to_file(cards, filename):
-    with open(filename, 'w') as file:
-        json.dump(cards, file, indent=4)
+    with open(filename, 'wb') as file:
+        file.write(_dumps(cards))
+
+# Sorts by the leading number of the collector number ("12a" -> 12), then by the full string
+def _collector_number_key(card):
+    m = _DIGITS.match(card['collector_number'])
+    return (int(m.group()) if m else 10**9, card['collector_number'])
 
 def print_cards(cards, number, set_name, legal_format, common_only, query):
-    # Sort cards by collector number
-    sorted_cards = sorted(cards, key=lambda x: int(''.join(filter(str.isdigit, x['collector_number']))) if x['collector_number'].isdigit() else float('inf'))
+    # Sort cards by collector number, touching each card dict only once
+    prepped = [(_collector_number_key(card), card['name']) for card in cards]
+    prepped.sort(key=itemgetter(0))
     
-    for card in sorted_cards:
-        if number == 0:
-            print(f"{card['name']} ({card['set'].upper()})")
-        else:
-            print(f"{number} {card['name']} ({card['set'].upper()})")
+    # Every card comes from the queried set, so its code is formatted once
+    prefix = f"{number} " if number else ""
+    suffix = f" ({set_name.upper()})"
+    lines = [prefix + name + suffix for _, name in prepped]
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
     
     # Print summary information
     print(f"\nQuery parameters:")
@@ -51,14 +207,27 @@ def print_cards(cards, number, set_name, legal_format, common_only, query):
 def main():
     parser = argparse.ArgumentParser(description='Fetch cards from Scryfall.')
     parser.add_argument('set_name', type=str, help='The name of the card set')
-    parser.add_argument('--legal_format', type=str, default='pauper', help='The legal format of the cards')
+    parser.add_argument('--legal_format', type=str.lower, default='pauper', choices=_LEGAL_FORMATS, help='The legal format of the cards')
     parser.add_argument('--common_only', action='store_true', help='Fetch only common cards')
     parser.add_argument('--number_choice', type=int, default=0, help='Enter a number to put in front the list from 0 to 4')
     parser.add_argument('--output_choice', type=str, default='n', help='Do you want to save the result to a file? (y/n)')
+    parser.add_argument('--jsonl_output', type=str, help='Stream the cards to this JSON Lines file instead of printing them')
+    parser.add_argument('--all_fields', action='store_true', help='Keep every Scryfall field in saved cards')
 
     args = parser.parse_args()
+    fields = None if args.all_fields else DEFAULT_FIELDS
+
+    try:
+        if args.jsonl_output:
+            count, query = fetch_cards_streaming(args.set_name, args.legal_format, args.common_only, args.jsonl_output, fields)
+            print(f"API call: https://api.scryfall.com/cards/search?q={query}")
+            print(f"Saved {count} cards to {args.jsonl_output}")
+            return
 
-    cards, query = fetch_cards(args.set_name, args.legal_format, args.common_only)
+        cards, query = fetch_cards(args.set_name, args.legal_format, args.common_only, fields)
+    except requests.exceptions.RequestException as e:
+        print(f"Error: {e}")
+        sys.exit(1)
     
     # Pass query parameters to print_cards
     print_cards(cards, args.number_choice, args.set_name, args.legal_format, args.common_only, query)